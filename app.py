@@ -2,30 +2,55 @@ import streamlit as st
 import pandas as pd
 from shl_engine import SHLRecommendationEngine
 
+# Sidebar options are fixed, so build them once at import instead of on every rerun
+_JOB_LEVEL_OPTIONS = ("entry", "professional", "manager", "executive", "all")
+
+_ALL_COMPETENCIES = (
+    "leadership", "teamwork", "communication", "problem solving", 
+    "critical thinking", "innovation", "resilience", "data analysis",
+    "customer focus", "sales ability", "technical skill", "coding",
+    "strategic thinking", "decision making", "people management"
+)
+
+@st.cache_resource
+def get_engine():
+    """Build the recommendation engine once and share it across reruns and sessions"""
+    return SHLRecommendationEngine()
+
+@st.cache_data
+def cached_recommend(_engine: SHLRecommendationEngine, criteria_key: tuple) -> pd.DataFrame:
+    """Memoize recommendations for a hashable snapshot of the sidebar inputs"""
+    # _engine is excluded from the cache key (leading underscore); it is the
+    # shared cached instance, so results depend only on criteria_key
+    job_role, job_level, competencies, max_time, global_only = criteria_key
+    
+    # Build criteria dictionary
+    criteria = {
+        "job_role": job_role,
+        "job_level": job_level,
+        "assessment_focus": list(competencies),
+        "time_constraints": max_time
+    }
+    
+    if global_only:
+        criteria["required_languages"] = ["global"]
+    
+    return _engine.recommend(criteria)
+
 def main():
     st.title("SHL Assessment Recommendation Tool")
     
-    # Initialize the recommendation engine
-    engine = SHLRecommendationEngine()
-    
     # Create sidebar for inputs
     st.sidebar.header("Input Criteria")
     
     job_role = st.sidebar.text_input("Job Role", 
                                      placeholder="e.g., Software Developer, Sales Manager")
     
-    job_level_options = ["entry", "professional", "manager", "executive", "all"]
-    job_level = st.sidebar.selectbox("Job Level", job_level_options)
+    job_level = st.sidebar.selectbox("Job Level", _JOB_LEVEL_OPTIONS)
     
     # Multi-select for competencies
-    all_competencies = [
-        "leadership", "teamwork", "communication", "problem solving", 
-        "critical thinking", "innovation", "resilience", "data analysis",
-        "customer focus", "sales ability", "technical skill", "coding",
-        "strategic thinking", "decision making", "people management"
-    ]
     selected_competencies = st.sidebar.multiselect(
-        "Key Competencies", all_competencies
+        "Key Competencies", _ALL_COMPETENCIES
     )
     
     # Time constraint slider
@@ -37,19 +62,19 @@ def main():
     
     # Button to get recommendations
     if st.sidebar.button("Get Recommendations"):
-        # Build criteria dictionary
-        criteria = {
-            "job_role": job_role,
-            "job_level": job_level,
-            "assessment_focus": selected_competencies,
-            "time_constraints": max_time
-        }
+        # The engine is only needed once recommendations are requested; reruns
+        # from editing the sidebar inputs never touch it
+        engine = get_engine()
         
-        if global_only:
-            criteria["required_languages"] = ["global"]
+        # Get recommendations (served from cache for repeated inputs) and keep
+        # them in session state so they survive the reruns triggered by the
+        # selector below, where the button reads False again
+        criteria_key = (job_role, job_level, tuple(sorted(selected_competencies)), max_time, global_only)
+        st.session_state.recommendations = cached_recommend(engine, criteria_key)
+        st.session_state.pop('selected_assessment', None)
         
-        # Get recommendations
-        recommendations = engine.recommend(criteria)
+    if 'recommendations' in st.session_state:
+        recommendations = st.session_state.recommendations
         
         # Display recommendations
         st.header("Recommended SHL Assessments")
@@ -58,19 +83,21 @@ def main():
             st.warning("No matching assessments found. Try adjusting your criteria.")
         else:
             # Display each recommendation as a card
-            for idx, rec in recommendations.iterrows():
-                with st.expander(f"{rec['name']} (Relevance: {rec['relevance_score']})"):
-                    st.write(f"**Assessment ID:** {rec['assessment_id']}")
-                    st.write(f"**Type:** {rec['assessment_type'].capitalize()}")
-                    st.write(f"**Duration:** {rec['duration_minutes']} minutes")
-                    st.write(f"**Ideal for:** {rec['ideal_for']}")
+            for rec in recommendations.itertuples(index=False):
+                with st.expander(f"{rec.name} (Relevance: {rec.relevance_score})"):
+                    st.write(f"**Assessment ID:** {rec.assessment_id}")
+                    st.write(f"**Type:** {rec.assessment_type.capitalize()}")
+                    st.write(f"**Duration:** {rec.duration_minutes} minutes")
+                    st.write(f"**Ideal for:** {rec.ideal_for}")
                     st.write("**Key competencies assessed:**")
-                    for comp in rec['competencies']:
+                    for comp in rec.competencies:
                         st.write(f"- {comp.capitalize()}")
-                    
-                    # Add a button to select this assessment
-                    if st.button(f"Select {rec['assessment_id']}", key=f"select_{idx}"):
-                        st.session_state.selected_assessment = rec['assessment_id']
+            
+            # A single selector instead of one button per recommendation
+            selected = st.selectbox("Select an assessment", recommendations['assessment_id'],
+                                    index=None, placeholder="Choose an assessment")
+            if selected is not None:
+                st.session_state.selected_assessment = selected
                         
             if 'selected_assessment' in st.session_state:
                 st.success(f"You've selected: {st.session_state.selected_assessment}")
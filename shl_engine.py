@@ -1,9 +1,29 @@
+import re
+from collections import defaultdict
+
+import numpy as np
 import pandas as pd
 
+# Anything that isn't a lowercase letter or digit separates keywords
+_TOKEN_RE = re.compile(r'[^a-z0-9]+')
+
+def _tokenize(text):
+    """Split text into lowercase alphanumeric tokens, keeping their order"""
+    return [token for token in _TOKEN_RE.split(text.lower()) if token]
+
+# Criteria keys recognized by SHLRecommendationEngine.recommend()
+_CRITERIA_KEYS = ('job_level', 'time_constraints', 'required_languages', 'job_role', 'assessment_focus')
+
+# Job levels known to the catalog; stored as a categorical so filters compare int codes
+_JOB_LEVELS = ('entry', 'professional', 'manager', 'executive', 'sales', 'technical', 'all')
+
 class SHLRecommendationEngine:
     def __init__(self):
         # Initialize with SHL product catalog data
         self.catalog = self._load_shl_catalog()
+        self._build_indexes(self.catalog)
+        # Compiled recommend() pipelines, keyed by the set of active criteria
+        self._pipelines = {}
         
     def _load_shl_catalog(self):
         """
@@ -63,9 +83,47 @@ class SHLRecommendationEngine:
             ]
         }
         
-        return pd.DataFrame(catalog_data)
+        catalog = pd.DataFrame(catalog_data)
+        catalog['job_level'] = catalog['job_level'].astype(pd.CategoricalDtype(categories=_JOB_LEVELS))
+        catalog['language_availability'] = catalog['language_availability'].astype('category')
+        
+        return catalog
+    
+    def _build_indexes(self, catalog):
+        """Derive the arrays and lookup indexes recommend() works on from the catalog"""
+        # Columnar view of the catalog (one typed array per field, with job_level and
+        # lang as Categoricals) used by recommend(); filtering 13 rows is cheaper on
+        # plain arrays than on a DataFrame
+        self.ids = catalog['assessment_id'].to_numpy()
+        self.names = catalog['name'].to_numpy()
+        self.assessment_types = catalog['assessment_type'].to_numpy()
+        self.job_level = catalog['job_level'].array
+        self.durations = catalog['duration_minutes'].to_numpy(dtype=np.int16)
+        self.competencies = catalog['competencies'].to_numpy()
+        self.ideal_for = catalog['ideal_for'].to_numpy()
+        self.lang = catalog['language_availability'].array
+        
+        # Inverted index from ideal_for keywords to catalog row positions; the
+        # catalog is static, so job-role scoring only needs a lookup per keyword
+        ideal_positions = defaultdict(list)
+        for pos, text in enumerate(self.ideal_for):
+            for token in self._extract_keywords(text):
+                ideal_positions[token].append(pos)
+        self._ideal_index = {token: np.array(positions, dtype=np.int16)
+                             for token, positions in ideal_positions.items()}
+        
+        # Inverted index from competency words/phrases to catalog row positions,
+        # so each focus keyword is a dict lookup instead of a scan of every row
+        self._comp_index = defaultdict(set)
+        for pos, competencies in enumerate(self.competencies):
+            for competency in competencies:
+                words = _tokenize(competency)
+                # Index every contiguous run of words (single tokens up to the full phrase)
+                for start in range(len(words)):
+                    for end in range(start + 1, len(words) + 1):
+                        self._comp_index[' '.join(words[start:end])].add(pos)
     
-    def recommend(self, criteria):
+    def recommend(self, criteria, top_k=10):
         """
         Recommend SHL assessments based on given criteria
         
@@ -77,63 +135,121 @@ class SHLRecommendationEngine:
             - assessment_focus (list): Competencies/skills to focus on
             - time_constraints (int): Maximum assessment time in minutes
             - required_languages (list): Required languages for the assessment
+        top_k (int): Maximum number of recommendations to return
         
         Returns:
-        DataFrame: Recommended assessments sorted by relevance score
+        DataFrame: Top recommended assessments sorted by relevance score
         """
-        # Start with full catalog
-        recommendations = self.catalog.copy()
-        recommendations['relevance_score'] = 0
+        # Only keys that actually switch on a filter or scorer determine the shape
+        shape = frozenset(key for key in _CRITERIA_KEYS
+                          if key in criteria and (key != 'required_languages' or criteria[key]))
+        pipeline = self._pipelines.get(shape)
+        if pipeline is None:
+            pipeline = self._pipelines[shape] = self._compile(shape)
+        return pipeline(criteria, top_k)
+    
+    def _compile(self, shape):
+        """
+        Build a recommend() pipeline specialized for one set of active criteria
         
-        # Apply filters and scoring based on criteria
-        if 'job_level' in criteria:
+        Only the filters and scorers whose keys are in ``shape`` are included,
+        so the returned closure does no per-call key checks. Anything that does
+        not depend on the criteria values is computed here, once per shape.
+        """
+        durations = self.durations
+        ideal_index, comp_index = self._ideal_index, self._comp_index
+        all_positions = np.arange(len(self.ids))
+        
+        filters = []
+        if 'job_level' in shape:
             # Filter for job level compatibility or 'all'
-            level_mask = (recommendations['job_level'] == criteria['job_level']) | (recommendations['job_level'] == 'all')
-            recommendations = recommendations[level_mask]
+            level_categories, level_codes = self.job_level.categories, self.job_level.codes
+            level_all = level_codes == level_categories.get_loc('all')
+            
+            def filter_job_level(criteria):
+                if criteria['job_level'] not in level_categories:
+                    return level_all
+                return (level_codes == level_categories.get_loc(criteria['job_level'])) | level_all
+            filters.append(filter_job_level)
             
-        if 'time_constraints' in criteria:
+        if 'time_constraints' in shape:
             # Filter by maximum duration
-            recommendations = recommendations[recommendations['duration_minutes'] <= criteria['time_constraints']]
+            filters.append(lambda criteria: durations <= criteria['time_constraints'])
             
-        if 'required_languages' in criteria and criteria['required_languages']:
+        if 'required_languages' in shape:
             # Filter by language availability (simplified)
             # This would need to be more sophisticated in a real implementation
-            recommendations = recommendations[recommendations['language_availability'] == 'global']
+            global_only = self.lang.codes == self.lang.categories.get_loc('global')
+            filters.append(lambda criteria: global_only)
             
-        if 'job_role' in criteria:
-            # Score by relevance to job role
-            job_keywords = self._extract_keywords(criteria['job_role'])
-            
-            # Check ideal_for field for matches
-            for idx, row in recommendations.iterrows():
-                ideal_keywords = self._extract_keywords(row['ideal_for'])
-                match_score = len(set(job_keywords) & set(ideal_keywords)) * 2
-                recommendations.at[idx, 'relevance_score'] += match_score
+        scorers = []
+        if 'job_role' in shape:
+            # Score by relevance to job role: keyword overlap with ideal_for
+            def score_job_role(criteria, scores):
+                for token in self._extract_keywords(criteria['job_role']):
+                    hits = ideal_index.get(token)
+                    if hits is not None:
+                        np.add.at(scores, hits, 2)
+            scorers.append(score_job_role)
         
-        if 'assessment_focus' in criteria:
+        if 'assessment_focus' in shape:
             # Score by competency coverage
-            for idx, row in recommendations.iterrows():
-                competency_matches = sum(1 for comp in criteria['assessment_focus'] 
-                                       if any(comp.lower() in c.lower() for c in row['competencies']))
-                recommendations.at[idx, 'relevance_score'] += competency_matches * 3
-                
-        # Sort by relevance score
-        recommendations = recommendations.sort_values(by='relevance_score', ascending=False)
+            def score_competencies(criteria, scores):
+                for comp in criteria['assessment_focus']:
+                    hits = comp_index.get(' '.join(_tokenize(comp)))
+                    if hits:
+                        np.add.at(scores, list(hits), 3)
+            scorers.append(score_competencies)
+            
+        def pipeline(criteria, top_k):
+            if filters:
+                positions = np.flatnonzero(np.logical_and.reduce([f(criteria) for f in filters]))
+            else:
+                positions = all_positions
+            # Every scorer adds into this one catalog-wide accumulator in place;
+            # the surviving rows are gathered from it once, after all scoring
+            scores = np.zeros(len(all_positions), dtype=np.int32)
+            for scorer in scorers:
+                scorer(criteria, scores)
+            return self._build_recommendations(positions, scores[positions], top_k)
+        
+        return pipeline
+    
+    def _build_recommendations(self, positions, scores, top_k):
+        """Materialize a DataFrame for the top_k surviving rows, sorted by relevance score"""
+        # Select the top_k scores in O(N) with argpartition, then sort just those
+        k = min(top_k, len(scores))
+        if k > 0:
+            # argpartition returns the top k in arbitrary order; restore catalog
+            # order first so the stable sort keeps ties in catalog order
+            top = np.sort(np.argpartition(-scores, k - 1)[:k])
+            order = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            order = np.empty(0, dtype=np.intp)
+        positions = positions[order]
         
-        # Return the top recommendations
-        return recommendations[['assessment_id', 'name', 'assessment_type', 'competencies', 
-                               'duration_minutes', 'ideal_for', 'relevance_score']]
+        return pd.DataFrame({
+            'assessment_id': self.ids[positions],
+            'name': self.names[positions],
+            'assessment_type': self.assessment_types[positions],
+            'competencies': self.competencies[positions],
+            'duration_minutes': self.durations[positions],
+            'ideal_for': self.ideal_for[positions],
+            'relevance_score': scores[order]
+        })
         
     def _extract_keywords(self, text):
         """Extract keywords from a text string"""
         # Simple keyword extraction (would be more sophisticated in a real implementation)
         if isinstance(text, str):
-            return [word.lower() for word in text.replace(',', ' ').split()]
-        return []
+            return set(_tokenize(text))
+        return set()
 
     def get_assessment_details(self, assessment_id):
         """Get detailed information about a specific assessment"""
-        result = self.catalog[self.catalog['assessment_id'] == assessment_id]
-        if result.empty:
+        # Match on the id array alone rather than boolean-indexing the whole
+        # catalog, which would copy the competencies list column
+        positions = np.flatnonzero(self.ids == assessment_id)
+        if len(positions) == 0:
             return None
-        return result.iloc[0].to_dict()
+        return self.catalog.iloc[positions[0]].to_dict()
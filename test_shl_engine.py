@@ -0,0 +1,23 @@
+from shl_engine import SHLRecommendationEngine
+
+
+def test_tied_recommendations_keep_catalog_order():
+    engine = SHLRecommendationEngine()
+    recommendations = engine.recommend({
+        "job_role": "Software Developer",
+        "job_level": "entry",
+        "assessment_focus": ["communication"],
+        "time_constraints": 30
+    })
+
+    assert list(recommendations['assessment_id']) == [
+        'OPQ32', 'REMOTE_WORKER', 'VERIFY-G+', 'MQ', 'MOTIVATION', 'CALL_CENTER', 'SITUATIONAL_JUDGMENT'
+    ]
+    assert list(recommendations['relevance_score']) == [3, 3, 0, 0, 0, 0, 0]
+
+
+def test_all_ties_return_catalog_order():
+    engine = SHLRecommendationEngine()
+    recommendations = engine.recommend({}, top_k=len(engine.catalog))
+
+    assert list(recommendations['assessment_id']) == list(engine.catalog['assessment_id'])